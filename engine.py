@@ -2,14 +2,31 @@ from abc import ABC, abstractmethod
 from enum import Enum, auto
 from dataclasses import dataclass
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import operator
 import sys
 import pandas as pd
 import numpy as np
+import bottleneck as bn
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pyarrow import csv as pacsv
 import os
 from collections import deque
-from queue import Queue, Empty
+from queue import Queue, SimpleQueue
 import threading
 
+try:
+    from numba import njit
+
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        return lambda f: f
+
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -17,11 +34,34 @@ logging.basicConfig(
 )
 
 logger = logging.getLogger(__name__)
+logging.getLogger("numba").setLevel(logging.WARNING)
+
+# Per-bar and per-batch records go to their own logger. It is silent and does
+# not propagate unless TradingEngine.enable_hot_path_logging() is called, so the
+# hot path only pays for an isEnabledFor() check.
+hot_logger = logging.getLogger(f"{__name__}.hot")
+hot_logger.propagate = False
+hot_logger.setLevel(logging.INFO)
+hot_logger.addHandler(logging.NullHandler())
+
+# OHLC prices are stored as float32 to halve the memory traffic of indicator
+# passes. Its 24-bit significand only holds a price exactly if the tick size is a
+# binary fraction (0.25, 0.5, ...) and the price is below 2**24 ticks, i.e. about
+# 2**22 for a 0.25 tick. Decimal ticks such as 0.01 are rounded, with a relative
+# error of up to 2**-24 (about 6e-5 at a price of 2000), and that error carries
+# into the indicators even though they accumulate in float64.
+PRICE_DTYPE = np.float32
+
+
+class _DeferredQueueHandler(QueueHandler):
+    # Enqueue records as-is; formatting happens on the listener thread.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
 
 
-@dataclass
+@dataclass(slots=True)
 class BarEventMessage:
-    ts_event: pd.Timestamp
+    ts_event_ns: int  # Nanoseconds since the UNIX epoch
     open: float
     high: float
     low: float
@@ -29,10 +69,14 @@ class BarEventMessage:
     volume: int
     symbol: str
 
+    @property
+    def ts_event(self) -> pd.Timestamp:
+        return pd.Timestamp(self.ts_event_ns, unit="ns")
+
 
-@dataclass
+@dataclass(slots=True)
 class ProcessedBarEventMessage:
-    ts_event: pd.Timestamp
+    ts_event_ns: int  # Nanoseconds since the UNIX epoch
     open: float
     high: float
     low: float
@@ -41,10 +85,14 @@ class ProcessedBarEventMessage:
     symbol: str
     indicators: dict  # Stores dynamic indicators
 
+    @property
+    def ts_event(self) -> pd.Timestamp:
+        return pd.Timestamp(self.ts_event_ns, unit="ns")
+
     @classmethod
     def from_bar(cls, bar: BarEventMessage, indicator_values: dict):
         return cls(
-            ts_event=bar.ts_event,
+            ts_event_ns=bar.ts_event_ns,
             open=bar.open,
             high=bar.high,
             low=bar.low,
@@ -55,6 +103,73 @@ class ProcessedBarEventMessage:
         )
 
 
+BAR_BATCH_COLUMNS = {
+    "ts_event": "ts",
+    "open": "o",
+    "high": "h",
+    "low": "l",
+    "close": "c",
+    "volume": "v",
+}
+
+
+@dataclass(slots=True)
+class BarBatch:
+    ts: np.ndarray
+    o: np.ndarray
+    h: np.ndarray
+    l: np.ndarray
+    c: np.ndarray
+    v: np.ndarray
+    symbol: str
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @classmethod
+    def from_bars(cls, bars: list[BarEventMessage]):
+        return cls(
+            ts=np.array([bar.ts_event_ns for bar in bars], dtype=np.int64).view(
+                "datetime64[ns]"
+            ),
+            o=np.array([bar.open for bar in bars], dtype=PRICE_DTYPE),
+            h=np.array([bar.high for bar in bars], dtype=PRICE_DTYPE),
+            l=np.array([bar.low for bar in bars], dtype=PRICE_DTYPE),
+            c=np.array([bar.close for bar in bars], dtype=PRICE_DTYPE),
+            v=np.array([bar.volume for bar in bars], dtype=np.int64),
+            symbol=bars[0].symbol,
+        )
+
+    def column(self, field: str) -> np.ndarray:
+        return getattr(self, BAR_BATCH_COLUMNS[field])
+
+    def bar(self, i: int) -> BarEventMessage:
+        return BarEventMessage(
+            ts_event_ns=int(self.ts[i].view(np.int64)),
+            open=self.o[i],
+            high=self.h[i],
+            low=self.l[i],
+            close=self.c[i],
+            volume=self.v[i],
+            symbol=self.symbol,
+        )
+
+
+@dataclass(slots=True)
+class ProcessedBarBatch:
+    bars: BarBatch
+    indicators: dict  # Indicator name -> array of values aligned with bars
+
+    def __len__(self) -> int:
+        return len(self.bars)
+
+    def processed_bar(self, i: int) -> ProcessedBarEventMessage:
+        return ProcessedBarEventMessage.from_bar(
+            self.bars.bar(i),
+            {name: values[i] for name, values in self.indicators.items()},
+        )
+
+
 class Modes(Enum):
     LIVE = auto()
     REPLAY = auto()
@@ -74,22 +189,142 @@ class Indicator(ABC):
     def value(self):
         pass
 
+    def update_batch(self, batch: BarBatch) -> np.ndarray:
+        out = np.empty(len(batch), dtype=np.float64)
+        for i in range(len(batch)):
+            self.update(batch.bar(i))
+            out[i] = self.value()
+        return out
+
+
+@njit(cache=True)
+def _sma_loop(values, period, buf, state, out):
+    # Same ring-buffer update as SimpleMovingAverage.update over a whole array;
+    # state holds [idx, count] and is updated in place.
+    idx = state[0]
+    count = state[1]
+    total = 0.0
+    for k in range(count):
+        total += buf[k]
+    for i in range(values.shape[0]):
+        x = float(values[i])
+        if count < period:
+            total += x
+            buf[count] = x
+            count += 1
+        else:
+            total += x - buf[idx]
+            buf[idx] = x
+            idx = (idx + 1) % period
+        if count == period:
+            out[i] = total / period
+        else:
+            out[i] = np.nan
+    state[0] = idx
+    state[1] = count
+    return total
+
 
 class SimpleMovingAverage(Indicator):
     def __init__(self, period: int, applied_on: str):
         self.period = period
         self.applied_on = applied_on
-        self.values = deque(maxlen=self.period)
+        self._get = operator.attrgetter(applied_on)
+        self._get_column = operator.attrgetter(BAR_BATCH_COLUMNS[applied_on])
+        self._buf = np.empty(self.period, dtype=np.float64)
+        self._idx = 0
+        self._sum = 0.0
+        self._count = 0
         self._current_value = np.nan
+        self._precomputed: np.ndarray | None = None
+        self._pos = 0
 
     @property
     def name(self) -> str:
         return f"SMA_{self.period}_{self.applied_on}"
 
+    def precompute(self, values: np.ndarray) -> np.ndarray:
+        # Compute the SMA for all upcoming values at once. Afterwards update()
+        # and update_batch() only step through the precomputed series.
+        window = np.roll(self._buf[: self._count], -self._idx)
+        series = np.concatenate((window, values), dtype=np.float64)
+        if len(series) < self.period:
+            # The window never fills; bottleneck rejects windows longer than
+            # the input.
+            self._precomputed = np.full(len(values), np.nan)
+        else:
+            self._precomputed = bn.move_mean(
+                series, self.period, min_count=self.period
+            )[len(window) :]
+        self._pos = 0
+        return self._precomputed
+
     def update(self, bar: BarEventMessage):
-        self.values.append(getattr(bar, self.applied_on))
-        if len(self.values) == self.period:
-            self._current_value = sum(self.values) / self.period
+        if self._precomputed is not None:
+            self._current_value = self._precomputed[self._pos]
+            self._pos += 1
+            return
+
+        x = float(self._get(bar))
+        if self._count < self.period:
+            self._sum += x
+            self._buf[self._count] = x
+            self._count += 1
+        else:
+            self._sum += x - self._buf[self._idx]
+            self._buf[self._idx] = x
+            self._idx = (self._idx + 1) % self.period
+            if self._idx == 0:
+                # Resync once per turn of the ring so rounding errors of the
+                # incremental updates cannot accumulate over long replays.
+                self._sum = float(self._buf.sum())
+        if self._count == self.period:
+            self._current_value = self._sum / self.period
+
+    def update_batch(self, batch: BarBatch) -> np.ndarray:
+        if self._precomputed is not None:
+            out = self._precomputed[self._pos : self._pos + len(batch)]
+            self._pos += len(batch)
+            if len(out):
+                self._current_value = out[-1]
+            return out
+
+        if not HAS_NUMBA:
+            return self._update_batch_cumsum(batch)
+
+        out = np.empty(len(batch), dtype=np.float64)
+        state = np.array([self._idx, self._count], dtype=np.int64)
+        self._sum = _sma_loop(
+            self._get_column(batch), self.period, self._buf, state, out
+        )
+        self._idx, self._count = int(state[0]), int(state[1])
+        if len(out) and self._count == self.period:
+            self._current_value = out[-1]
+        return out
+
+    def _update_batch_cumsum(self, batch: BarBatch) -> np.ndarray:
+        # Vectorised fallback when Numba is not installed: prepend the current
+        # window and take differences of a float64 cumulative sum.
+        x = self._get_column(batch)
+        if len(x) == 0:
+            return np.empty(0, dtype=np.float64)
+
+        window = np.roll(self._buf[: self._count], -self._idx)
+        values = np.concatenate((window, x), dtype=np.float64)
+        csum = np.concatenate(([0.0], np.cumsum(values)))
+        ends = np.arange(len(window) + 1, len(values) + 1)
+        out = np.full(len(x), np.nan)
+        full = ends >= self.period
+        out[full] = (csum[ends[full]] - csum[ends[full] - self.period]) / self.period
+
+        tail = values[-self.period :]
+        self._buf[: len(tail)] = tail
+        self._count = len(tail)
+        self._idx = 0
+        self._sum = float(tail.sum())
+        if self._count == self.period:
+            self._current_value = out[-1]
+        return out
 
     def value(self):
         return self._current_value
@@ -101,9 +336,17 @@ class DataHandler(ABC):
     def get_next_bar(self):
         pass
 
+    @abstractmethod
+    def get_next_batch(self):
+        pass
+
 
 class ReplayDataHandler(DataHandler):
 
+    batch_size: int = 4096
+    read_block_size: int = 16 << 20  # Bytes of CSV parsed per block
+    cache_batch_size: int = 1 << 20  # Rows read from the Parquet cache per block
+
     def __init__(self, symbol: str):
         try:
             files = [f for f in os.listdir("csv_port") if f.endswith(".csv")]
@@ -116,9 +359,71 @@ class ReplayDataHandler(DataHandler):
                 f"Connected to CSV port: {self.path_to_csv} for symbol: {self.symbol}"
             )
 
-            self.data_iterator = pd.read_csv(
-                self.path_to_csv,
-                usecols=[
+            # Parsed columns are cached as Parquet next to the CSV and reused
+            # until the CSV is modified.
+            self.path_to_cache = os.path.splitext(self.path_to_csv)[0] + ".parquet"
+            csv_fingerprint = self._csv_fingerprint()
+            cache = self._open_cache(csv_fingerprint)
+            if cache is not None:
+                logger.info(f"Reading cached replay data: {self.path_to_cache}")
+                schema = cache.schema_arrow
+                record_batches = cache.iter_batches(batch_size=self.cache_batch_size)
+            else:
+                reader = self._open_csv()
+                schema = reader.schema
+                record_batches = self._write_cache(reader, csv_fingerprint)
+
+            # Keep only this symbol's rows as the blocks stream in, so other
+            # symbols' rows are never held in memory all at once. Symbols are
+            # dictionary-encoded, so the filter compares integer codes against
+            # the symbol's code in each block's dictionary.
+            selected = []
+            for record_batch in record_batches:
+                symbols = record_batch.column("symbol")
+                selected.append(
+                    record_batch.filter(
+                        pc.equal(symbols.indices, symbols.dictionary.index(self.symbol))
+                    )
+                )
+            table = pa.Table.from_batches(selected, schema=schema)
+
+            # ts_event is already nanoseconds since the epoch, so cast the int64
+            # column to an Arrow timestamp instead of parsing it. Unlike viewing
+            # the NumPy array, this keeps missing values as NaT.
+            self._ts = (
+                table["ts_event"]
+                .cast(pa.timestamp("ns"))
+                .to_numpy(zero_copy_only=False)
+            )
+            self._o = (table["open"].to_numpy(zero_copy_only=False) * 1e-9).astype(
+                PRICE_DTYPE
+            )
+            self._h = (table["high"].to_numpy(zero_copy_only=False) * 1e-9).astype(
+                PRICE_DTYPE
+            )
+            self._l = (table["low"].to_numpy(zero_copy_only=False) * 1e-9).astype(
+                PRICE_DTYPE
+            )
+            self._c = (table["close"].to_numpy(zero_copy_only=False) * 1e-9).astype(
+                PRICE_DTYPE
+            )
+            self._v = table["volume"].to_numpy(zero_copy_only=False)
+            self._i = 0
+
+            logger.info(f"Loaded {len(self._ts)} bars for symbol: {self.symbol}")
+
+        except Exception as e:
+            logger.critical(f"Error: {e}", exc_info=False)
+            sys.exit(1)
+
+    def _open_csv(self) -> pacsv.CSVStreamingReader:
+        return pacsv.open_csv(
+            self.path_to_csv,
+            read_options=pacsv.ReadOptions(
+                use_threads=True, block_size=self.read_block_size
+            ),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=[
                     "ts_event",
                     "open",
                     "high",
@@ -127,47 +432,145 @@ class ReplayDataHandler(DataHandler):
                     "volume",
                     "symbol",
                 ],
-                dtype={
-                    "open": int,
-                    "high": int,
-                    "low": int,
-                    "close": int,
-                    "volume": int,
-                    "symbol": str,
+                column_types={
+                    "ts_event": pa.int64(),
+                    "open": pa.int64(),
+                    "high": pa.int64(),
+                    "low": pa.int64(),
+                    "close": pa.int64(),
+                    "volume": pa.int64(),
+                    "symbol": pa.dictionary(pa.int32(), pa.string()),
                 },
-                iterator=True,
-                chunksize=1,
+            ),
+        )
+
+    def _csv_fingerprint(self) -> dict[bytes, bytes]:
+        # Stored in the cache's key-value metadata to tell which CSV it was
+        # built from.
+        stat = os.stat(self.path_to_csv)
+        return {
+            b"csv_mtime_ns": str(stat.st_mtime_ns).encode(),
+            b"csv_size": str(stat.st_size).encode(),
+        }
+
+    def _open_cache(self, csv_fingerprint: dict[bytes, bytes]) -> pq.ParquetFile | None:
+        if not os.path.exists(self.path_to_cache):
+            return None
+        try:
+            cache = pq.ParquetFile(self.path_to_cache, memory_map=True)
+        except (OSError, pa.ArrowException) as e:
+            logger.warning(f"Ignoring unreadable replay data cache: {e}")
+            return None
+
+        metadata = cache.schema_arrow.metadata or {}
+        if any(metadata.get(key) != value for key, value in csv_fingerprint.items()):
+            cache.close()
+            return None
+        return cache
+
+    def _write_cache(
+        self, reader: pacsv.CSVStreamingReader, csv_fingerprint: dict[bytes, bytes]
+    ):
+        # Pass the CSV blocks through while writing all of them (every symbol)
+        # to the cache. The file is only moved into place once complete.
+        # Caching is best-effort: if writing fails, the CSV keeps streaming.
+        path_to_partial_cache = self.path_to_cache + ".partial"
+        try:
+            writer = pq.ParquetWriter(
+                path_to_partial_cache, reader.schema.with_metadata(csv_fingerprint)
             )
+        except (OSError, pa.ArrowException) as e:
+            self._discard_cache(None, e)
+            writer = None
 
-        except Exception as e:
-            logger.critical(f"Error: {e}", exc_info=False)
-            sys.exit(1)
+        try:
+            for record_batch in reader:
+                if writer is not None:
+                    try:
+                        writer.write_batch(record_batch)
+                    except (OSError, pa.ArrowException) as e:
+                        self._discard_cache(writer, e)
+                        writer = None
+                yield record_batch
+
+            if writer is not None:
+                try:
+                    writer.close()
+                    os.replace(path_to_partial_cache, self.path_to_cache)
+                except (OSError, pa.ArrowException) as e:
+                    self._discard_cache(writer, e)
+                else:
+                    logger.info(f"Cached replay data: {self.path_to_cache}")
+                writer = None
+        finally:
+            # Reading the CSV failed or the blocks were not fully consumed.
+            if writer is not None:
+                self._discard_cache(writer, None)
+
+    def _discard_cache(self, writer: pq.ParquetWriter | None, error: Exception | None):
+        if error is not None:
+            logger.warning(f"Could not cache replay data: {error}")
+        if writer is not None:
+            try:
+                writer.close()
+            except (OSError, pa.ArrowException):
+                pass
+        try:
+            os.remove(self.path_to_cache + ".partial")
+        except OSError:
+            pass
 
     def get_next_bar(self) -> BarEventMessage | None:
-        try:
-            while True:
-                row = next(self.data_iterator)
-
-                if row["symbol"].values[0] == self.symbol:
-                    return BarEventMessage(
-                        ts_event=pd.to_datetime(row["ts_event"].values[0], unit="ns"),
-                        open=row["open"].values[0] / 1e9,
-                        high=row["high"].values[0] / 1e9,
-                        low=row["low"].values[0] / 1e9,
-                        close=row["close"].values[0] / 1e9,
-                        volume=row["volume"].values[0],
-                        symbol=row["symbol"].values[0],
-                    )
-        except StopIteration:
+        i = self._i
+        if i >= len(self._ts):
             logger.info(f"End of data reached for symbol: {self.symbol}")
             return None
-        except Exception as e:
-            logger.error(f"Error reading next bar: {e}", exc_info=False)
+        self._i = i + 1
+        return BarEventMessage(
+            ts_event_ns=int(self._ts[i].view(np.int64)),
+            open=self._o[i],
+            high=self._h[i],
+            low=self._l[i],
+            close=self._c[i],
+            volume=self._v[i],
+            symbol=self.symbol,
+        )
+
+    def get_next_batch(self) -> BarBatch | None:
+        i = self._i
+        if i >= len(self._ts):
+            logger.info(f"End of data reached for symbol: {self.symbol}")
             return None
+        j = min(i + self.batch_size, len(self._ts))
+        self._i = j
+        return BarBatch(
+            ts=self._ts[i:j],
+            o=self._o[i:j],
+            h=self._h[i:j],
+            l=self._l[i:j],
+            c=self._c[i:j],
+            v=self._v[i:j],
+            symbol=self.symbol,
+        )
+
+    def remaining_bars(self) -> BarBatch:
+        # All bars not yet handed out, without advancing the cursor.
+        i = self._i
+        return BarBatch(
+            ts=self._ts[i:],
+            o=self._o[i:],
+            h=self._h[i:],
+            l=self._l[i:],
+            c=self._c[i:],
+            v=self._v[i:],
+            symbol=self.symbol,
+        )
 
 
 class TradingEngine:
 
+    max_batch_size: int = 4096
+
     def __init__(self, *, mode: Modes, symbol: str):
         if mode not in Modes:
             logger.error(
@@ -177,11 +580,15 @@ class TradingEngine:
         logger.info(f"Trading Engine started in {mode.name} mode")
         self.mode: Modes = mode
         self.symbol: str = symbol
-        self.incoming_bar_event_queue = Queue()
+        self.incoming_bar_event_queue = deque()
+        self._incoming_bar_event_cv = threading.Condition()
         self.processed_bar_event_queue = Queue()
         self.indicators: dict = {}
         self._stop_event = threading.Event()
         self._graceful_stop: bool = False
+        self._threads: list[threading.Thread] = []
+        self._hot_log_listener: QueueListener | None = None
+        self._hot_log_handler: _DeferredQueueHandler | None = None
 
         try:
             if self.mode == Modes.LIVE:
@@ -200,16 +607,78 @@ class TradingEngine:
         self.indicators[indicator.name] = indicator
         logger.info(f"Added indicator: {indicator.name}")
 
+    def enable_hot_path_logging(self, path: str):
+        # Records are handed to a background listener through a lock-free queue
+        # and only formatted and written to the file there.
+        if self._hot_log_listener is not None:
+            logger.warning("Hot path logging is already enabled. Ignoring.")
+            return
+
+        file_handler = logging.FileHandler(path)
+        file_handler.setFormatter(
+            logging.Formatter(
+                "%(asctime)s - %(levelname)s - %(threadName)s - %(message)s"
+            )
+        )
+        log_queue = SimpleQueue()
+        self._hot_log_listener = QueueListener(log_queue, file_handler)
+        self._hot_log_listener.start()
+        self._hot_log_handler = _DeferredQueueHandler(log_queue)
+        hot_logger.addHandler(self._hot_log_handler)
+        hot_logger.setLevel(logging.DEBUG)
+        logger.info(f"Hot path logging enabled: {path}")
+
     def connect(self):
+        if self.mode == Modes.REPLAY:
+            # The whole replay is known upfront, so SMAs are computed over the
+            # full series once and then only sliced per batch.
+            bars = self.data_handler.remaining_bars()
+            for indicator in self.indicators.values():
+                if isinstance(indicator, SimpleMovingAverage):
+                    indicator.precompute(bars.column(indicator.applied_on))
+
+            # Replay data is local, so there is no I/O latency worth overlapping
+            # with processing: fetch and process on a single thread.
+            self.replay_market_data_thread = threading.Thread(
+                target=self._replay_market_data, name="ReplayMarketDataThread"
+            )
+            self.replay_market_data_thread.start()
+            self._threads.append(self.replay_market_data_thread)
+            return
+
         self.fetch_market_data_thread = threading.Thread(
             target=self._fetch_market_data, name="FetchMarketDataThread"
         )
         self.fetch_market_data_thread.start()
+        self._threads.append(self.fetch_market_data_thread)
 
         self.process_market_data_thread = threading.Thread(
             target=self._process_market_data, name="ProcessMarketDataThread"
         )
         self.process_market_data_thread.start()
+        self._threads.append(self.process_market_data_thread)
+
+    def _replay_market_data(self):
+        logger.info(f"Thread started")
+
+        while not self._stop_event.is_set():
+            batch = self.data_handler.get_next_batch()
+            if batch is None:
+                logger.info(f"End of data reached for symbol: {self.symbol}.")
+                break
+            self._process_bar_batch(batch)
+
+    def _process_bar_batch(self, batch: BarBatch):
+        indicator_values = {}
+
+        for name, indicator in self.indicators.items():
+            indicator_values[name] = indicator.update_batch(batch)
+
+        processed_bar_batch = ProcessedBarBatch(bars=batch, indicators=indicator_values)
+        self.processed_bar_event_queue.put(processed_bar_batch)
+
+        if hot_logger.isEnabledFor(logging.DEBUG):
+            hot_logger.debug("Enqueued processed bar batch: %s", processed_bar_batch)
 
     def _fetch_market_data(self):
         logger.info(f"Thread started")
@@ -219,44 +688,47 @@ class TradingEngine:
             if bar is None:
                 logger.info(f"End of data reached for symbol: {self.symbol}.")
                 break
-            self.incoming_bar_event_queue.put(bar)
-            logger.debug(f"Enqueued new bar event: {bar}")
+            self.incoming_bar_event_queue.append(bar)
+            with self._incoming_bar_event_cv:
+                self._incoming_bar_event_cv.notify()
+            if hot_logger.isEnabledFor(logging.DEBUG):
+                hot_logger.debug("Enqueued new bar event: %s", bar)
 
     def _process_market_data(self):
         logger.info(f"Thread started")
 
         while not self._stop_event.is_set():
+            with self._incoming_bar_event_cv:
+                while (
+                    not self.incoming_bar_event_queue and not self._stop_event.is_set()
+                ):
+                    self._incoming_bar_event_cv.wait(timeout=0.02)
+
+            # Drain everything that has queued up (up to max_batch_size) and
+            # process it as a single batch.
+            bars = []
             try:
-                bar_event_message = self.incoming_bar_event_queue.get(timeout=0.02)
-                logger.debug(f"Received bar event: {bar_event_message}")
-
-                if self._stop_event.is_set() and not self._graceful_stop:
-                    logger.info(
-                        "Processing thread terminating immediately due to stop request (graceful=False)."
-                    )
-                    break
-
-                self.incoming_bar_event_queue.task_done()
-
-                indicator_values = {}
-
-                for name, indicator in self.indicators.items():
-                    indicator.update(bar_event_message)
-                    indicator_values[name] = indicator.value()
+                for _ in range(
+                    min(len(self.incoming_bar_event_queue), self.max_batch_size)
+                ):
+                    bars.append(self.incoming_bar_event_queue.popleft())
+            except IndexError:
+                pass
+
+            if not bars:
+                logger.info("Processing thread exiting due to stop event.")
+                break
 
-                processed_bar_event_message = ProcessedBarEventMessage.from_bar(
-                    bar_event_message, indicator_values
-                )
-                self.processed_bar_event_queue.put(processed_bar_event_message)
+            if hot_logger.isEnabledFor(logging.DEBUG):
+                hot_logger.debug("Received %d bar events", len(bars))
 
-                logger.debug(
-                    f"Enqueued processed bar event: {processed_bar_event_message}"
+            if self._stop_event.is_set() and not self._graceful_stop:
+                logger.info(
+                    "Processing thread terminating immediately due to stop request (graceful=False)."
                 )
+                break
 
-            except Empty:
-                if self._stop_event.is_set():
-                    logger.info("Processing thread exiting due to stop event.")
-                    break
+            self._process_bar_batch(BarBatch.from_bars(bars))
 
     def stop(self, graceful: bool = False):
         logger.info(f"Stopping Trading Engine (graceful={graceful})...")
@@ -264,12 +736,28 @@ class TradingEngine:
         self._stop_event.set()
 
         if not graceful:
-            while not self.incoming_bar_event_queue.empty():
-                try:
-                    self.incoming_bar_event_queue.get_nowait()
-                except Empty:
-                    break
+            self.incoming_bar_event_queue.clear()
+
+        with self._incoming_bar_event_cv:
+            self._incoming_bar_event_cv.notify_all()
+
+        for thread in self._threads:
+            thread.join()
+
+        if self._hot_log_listener is not None:
+            # Detach this engine's handler first so nothing is queued after its
+            # listener has stopped draining the queue. The logger goes back to
+            # silent once no engine is logging to it.
+            hot_logger.removeHandler(self._hot_log_handler)
+            if not any(
+                isinstance(handler, _DeferredQueueHandler)
+                for handler in hot_logger.handlers
+            ):
+                hot_logger.setLevel(logging.INFO)
+            self._hot_log_listener.stop()
+            for handler in self._hot_log_listener.handlers:
+                handler.close()
+            self._hot_log_listener = None
+            self._hot_log_handler = None
 
-        self.fetch_market_data_thread.join()
-        self.process_market_data_thread.join()
         logger.info("Trading Engine stopped.")